@@ -4,37 +4,46 @@ Analytical helpers for the Douban Top 250 dataset.
 
 from __future__ import annotations
 
+from collections import Counter
+from itertools import chain
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from scraper import Movie
 
+# Label columns that are repeatedly grouped and filtered on.
+_CATEGORICAL_COLUMNS = ("country", "decade", "primary_genre")
+# Vote counts stay far below 2**31. Ratings remain float64: one-decimal values
+# are not exact in float32, which shifts displayed averages and tie order.
+_NARROW_DTYPES = {"votes": "int32"}
+
 
 def movies_to_dataframe(movies: Iterable[Movie]) -> pd.DataFrame:
     """Convert an iterable of `Movie` dataclasses to a tidy DataFrame."""
-    records = [
+    movies = list(movies)
+    genres = [movie.genres for movie in movies]
+    df = pd.DataFrame(
         {
-            "rank": movie.rank,
-            "title": movie.title,
-            "original_title": movie.original_title,
-            "year": movie.year,
-            "country": movie.country,
-            "genres": movie.genres,
-            "rating": movie.rating,
-            "votes": movie.votes,
-            "quote": movie.quote,
-            "detail_url": movie.detail_url,
+            "rank": [movie.rank for movie in movies],
+            "title": [movie.title for movie in movies],
+            "original_title": [movie.original_title for movie in movies],
+            "year": [movie.year for movie in movies],
+            "country": [movie.country for movie in movies],
+            "genres": genres,
+            "rating": [movie.rating for movie in movies],
+            "votes": [movie.votes for movie in movies],
+            "quote": [movie.quote for movie in movies],
+            "detail_url": [movie.detail_url for movie in movies],
         }
-        for movie in movies
-    ]
-    df = pd.DataFrame(records)
+    )
     if not df.empty:
-        df["decade"] = df["year"].apply(_year_to_decade)
-        df["primary_genre"] = df["genres"].apply(lambda items: items[0] if items else None)
-        df["all_genres"] = df["genres"].apply(lambda items: ", ".join(items))
+        df["decade"] = _years_to_decades(df["year"])
+        df["primary_genre"] = [items[0] if items else None for items in genres]
+        df["all_genres"] = [", ".join(items) for items in genres]
+        _compact_dtypes(df)
     return df
 
 
@@ -47,11 +56,13 @@ def load_cached_movies(cache_path: str | Path) -> pd.DataFrame:
         )
     data = pd.read_json(cache_file)
     if "genres" in data.columns:
-        data["genres"] = data["genres"].apply(lambda x: x if isinstance(x, list) else [])
-        data["all_genres"] = data["genres"].apply(lambda xs: ", ".join(xs))
-        data["primary_genre"] = data["genres"].apply(lambda xs: xs[0] if xs else None)
+        genres = [items if isinstance(items, list) else [] for items in data["genres"].tolist()]
+        data["genres"] = genres
+        data["all_genres"] = [", ".join(items) for items in genres]
+        data["primary_genre"] = [items[0] if items else None for items in genres]
     if "year" in data.columns:
-        data["decade"] = data["year"].apply(_year_to_decade)
+        data["decade"] = _years_to_decades(data["year"])
+    _compact_dtypes(data)
     return data
 
 
@@ -67,12 +78,9 @@ def votes_summary(df: pd.DataFrame) -> pd.Series:
 
 def movies_per_country(df: pd.DataFrame, *, top_n: Optional[int] = None) -> pd.Series:
     """Aggregate movies by country."""
-    counts = (
-        df.assign(country=df["country"].fillna("未知国家"))
-        .groupby("country")["title"]
-        .count()
-        .sort_values(ascending=False)
-    )
+    counts = df.groupby("country", dropna=False, observed=True)["title"].count()
+    counts.index = counts.index.astype(object).fillna("未知国家")
+    counts = counts.sort_values(ascending=False)
     if top_n:
         counts = counts.head(top_n)
     return counts
@@ -82,17 +90,46 @@ def movies_per_decade(df: pd.DataFrame) -> pd.Series:
     """Aggregate movies by decade."""
     return (
         df.dropna(subset=["decade"])
-        .groupby("decade")["title"]
+        .groupby("decade", observed=True)["title"]
         .count()
         .sort_values(ascending=True)
     )
 
 
+def decade_rating_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Return mean rating and movie count per decade, oldest decade first."""
+    codes, decades = pd.factorize(df["decade"])
+    ratings = df["rating"].to_numpy(dtype=float)
+    valid = (codes >= 0) & ~np.isnan(ratings)
+    counts = np.bincount(codes[valid], minlength=len(decades))
+    sums = np.bincount(codes[valid], weights=ratings[valid], minlength=len(decades))
+    stats = pd.DataFrame(
+        {
+            "decade": np.asarray(decades, dtype=object),
+            "avg_rating": sums / np.maximum(counts, 1),
+            "count": counts,
+        }
+    )
+    return stats[stats["count"] > 0].sort_values("decade")
+
+
 def rating_distribution(df: pd.DataFrame, bins: Optional[int] = None) -> pd.Series:
     """Return the rating distribution as a histogram counts series."""
     if bins is None:
         bins = max(5, int(df["rating"].nunique()))
-    counts, bin_edges = np.histogram(df["rating"], bins=bins, range=(df["rating"].min(), 10))
+    low, high = float(df["rating"].min()), 10.0
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    ratings = df["rating"].to_numpy(dtype=float)
+    ratings = ratings[(ratings >= low) & (ratings <= high)]
+    bin_edges = np.linspace(low, high, bins + 1)
+    # Equal-width bins let us compute the bin index directly and count with
+    # bincount; the two corrections mirror np.histogram's edge rounding.
+    idx = ((ratings - low) * (bins / (high - low))).astype(np.intp)
+    idx[idx == bins] -= 1
+    idx[ratings < bin_edges[idx]] -= 1
+    idx[(ratings >= bin_edges[idx + 1]) & (idx != bins - 1)] += 1
+    counts = np.bincount(idx, minlength=bins)
     labels = [
         f"{bin_edges[i]:.1f} - {bin_edges[i + 1]:.1f}"
         for i in range(len(bin_edges) - 1)
@@ -100,25 +137,142 @@ def rating_distribution(df: pd.DataFrame, bins: Optional[int] = None) -> pd.Seri
     return pd.Series(counts, index=labels)
 
 
+def top_movies(df: pd.DataFrame, column: str, n: int) -> pd.DataFrame:
+    """Return the `n` rows with the largest `column`, like `nlargest(keep="first")`.
+
+    The cut-off value is found with an O(N) partition, and only the selected
+    rows are sorted; ties keep their original row order.
+    """
+    values = df[column].to_numpy()
+    if n >= len(values):
+        return df.iloc[np.argsort(-values, kind="stable")]
+    if n <= 0:
+        return df.iloc[:0]
+    threshold = np.partition(values, len(values) - n)[len(values) - n]
+    above = np.flatnonzero(values > threshold)
+    ties = np.flatnonzero(values == threshold)[: n - len(above)]
+    selected = np.concatenate([above, ties])
+    return df.iloc[selected[np.argsort(-values[selected], kind="stable")]]
+
+
+def rating_counts(df: pd.DataFrame) -> pd.Series:
+    """Return the number of movies at each 0.1 rating step, with empty steps as zero."""
+    steps = np.rint(df["rating"].dropna().to_numpy(dtype=float) * 10).astype(np.int64)
+    if len(steps) == 0:
+        return pd.Series([], dtype="int64")
+    low = steps.min()
+    counts = np.bincount(steps - low)
+    return pd.Series(counts, index=np.round((np.arange(len(counts)) + low) / 10, 1))
+
+
 def genre_popularity(df: pd.DataFrame, *, top_n: Optional[int] = None) -> pd.Series:
     """Return counts of movies per genre."""
-    exploded = df.explode("genres")
-    counts = (
-        exploded.dropna(subset=["genres"])
-        .groupby("genres")["title"]
-        .count()
-        .sort_values(ascending=False)
-    )
+    tally = Counter(chain.from_iterable(genres for genres in df["genres"] if genres))
+    counts = pd.Series(tally, dtype="int64").sort_index().sort_values(ascending=False)
     if top_n:
         counts = counts.head(top_n)
     return counts
 
 
-def _year_to_decade(year: Optional[int]) -> Optional[str]:
-    if year is None or pd.isna(year):
-        return None
-    decade_start = int(year // 10 * 10)
-    return f"{decade_start}s"
+def country_stats(
+    df: pd.DataFrame, *, min_movies: int = 5, top_n: Optional[int] = None
+) -> Tuple[pd.Series, pd.DataFrame]:
+    """Return per-country movie counts and rating stats from a single groupby.
+
+    Counts label movies without a country as "未知国家", like
+    `movies_per_country`. The rating table leaves those movies out and keeps
+    countries with at least `min_movies` movies, best rated first.
+    """
+    stats = df.groupby("country", dropna=False, observed=True)["rating"].agg(["count", "mean"])
+    counts = stats["count"]
+
+    rating_stats = (
+        stats.reset_index()
+        .rename(columns={"mean": "avg_rating"})[["country", "avg_rating", "count"]]
+        .dropna(subset=["country"])
+    )
+    rating_stats = rating_stats[rating_stats["count"] >= min_movies].sort_values(
+        "avg_rating", ascending=False
+    )
+    if top_n:
+        rating_stats = rating_stats.head(top_n)
+
+    counts.index = counts.index.astype(object).fillna("未知国家")
+    return counts.sort_values(ascending=False), rating_stats
+
+
+def split_genres(df: pd.DataFrame) -> List[List[str]]:
+    """Split each movie's space separated genre strings into individual genres."""
+    return [
+        [genre for genre_str in (genres or []) for genre in genre_str.split()]
+        for genres in df["genres"].tolist()
+    ]
+
+
+def individual_genre_counts(split_lists: List[List[str]]) -> pd.Series:
+    """Return counts of individual genres, most common first.
+
+    Ties keep first-seen order, matching `Counter.most_common`.
+    """
+    flat = np.fromiter(chain.from_iterable(split_lists), dtype=object)
+    genres, first_seen, counts = np.unique(flat, return_index=True, return_counts=True)
+    order = np.lexsort((first_seen, -counts))
+    return pd.Series(counts[order], index=genres[order], dtype="int64")
+
+
+def genre_rating_stats(
+    split_lists: List[List[str]],
+    ratings: np.ndarray,
+    *,
+    min_movies: int = 5,
+    top_n: Optional[int] = None,
+) -> pd.DataFrame:
+    """Return mean rating and movie count per individual genre, best rated first."""
+    genre_df = pd.DataFrame(
+        {
+            "genre": list(chain.from_iterable(split_lists)),
+            "rating": np.repeat(ratings, [len(genres) for genres in split_lists]),
+        }
+    )
+    stats = genre_df.groupby("genre", as_index=False).agg(
+        avg_rating=("rating", "mean"), count=("rating", "count")
+    )
+    stats = stats[stats["count"] >= min_movies].sort_values("avg_rating", ascending=False)
+    if top_n:
+        stats = stats.head(top_n)
+    return stats
+
+
+def genre_cooccurrence(split_lists: List[List[str]], top_genres: List[str]) -> pd.DataFrame:
+    """Count how often each pair of `top_genres` appears on the same movie."""
+    genre_index = {genre: i for i, genre in enumerate(top_genres)}
+    matrix = np.zeros((len(top_genres), len(top_genres)), dtype=np.int64)
+    for genres in split_lists:
+        relevant_ids = [genre_index[g] for g in genres if g in genre_index]
+        if relevant_ids:
+            # One outer-product increment covers both (i, j) and (j, i) plus the diagonal.
+            matrix[np.ix_(relevant_ids, relevant_ids)] += 1
+    return pd.DataFrame(matrix, index=top_genres, columns=top_genres)
+
+
+def _compact_dtypes(df: pd.DataFrame) -> None:
+    """Store label columns as categoricals and numeric columns narrowed, in place."""
+    for column in _CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    for column, dtype in _NARROW_DTYPES.items():
+        if column in df.columns:
+            df[column] = df[column].astype(dtype)
+
+
+def _years_to_decades(years: pd.Series) -> np.ndarray:
+    """Map a column of years to decade labels such as "1990s" (None if missing)."""
+    values = pd.to_numeric(years, errors="coerce").to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    decades = np.full(len(values), None, dtype=object)
+    starts = (values[valid] // 10 * 10).astype(np.int64)
+    decades[valid] = np.char.add(starts.astype(str), "s").tolist()
+    return decades
 
 
 __all__ = [
@@ -128,7 +282,15 @@ __all__ = [
     "votes_summary",
     "movies_per_country",
     "movies_per_decade",
+    "decade_rating_stats",
     "rating_distribution",
+    "rating_counts",
+    "top_movies",
     "genre_popularity",
+    "country_stats",
+    "split_genres",
+    "individual_genre_counts",
+    "genre_rating_stats",
+    "genre_cooccurrence",
 ]
 
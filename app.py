@@ -5,7 +5,7 @@
 """
 import streamlit as st
 from config import STREAMLIT_CONFIG
-from utils import load_data, init_sidebar, apply_filters, init_page_style
+from utils import load_data, init_sidebar, apply_filters, get_filter_signature, init_page_style
 from pages_overview import render_overview
 from pages_ranking import render_ranking
 from pages_rating import render_rating_analysis
@@ -36,6 +36,8 @@ def main():
         # 如果点击刷新按钮，重新加载
         if force_refresh:
             df, source = load_data(True)
+            # 清空缓存，重跑后重新读取新数据并重新计算聚合结果
+            st.cache_resource.clear()
             st.sidebar.success(f"✅ 数据{source}成功")
             st.rerun()
         else:
@@ -51,6 +53,7 @@ def main():
     
     # 应用筛选
     filtered_df = apply_filters(df, min_rating, max_rating, selected_decades)
+    signature = get_filter_signature(min_rating, max_rating, selected_decades)
     
     # 创建页面标签
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -72,10 +75,10 @@ def main():
         render_rating_analysis(filtered_df)
     
     with tab4:
-        render_location_analysis(filtered_df)
+        render_location_analysis(signature)
     
     with tab5:
-        render_genre_analysis(filtered_df)
+        render_genre_analysis(signature)
     
     # 页脚
     st.markdown("---")
@@ -0,0 +1,41 @@
+"""按筛选条件缓存的聚合结果
+
+缓存键只使用筛选签名 (min_rating, max_rating, decades)，而不是筛选后的
+DataFrame，这样 Streamlit 每次重跑时只需哈希一个很小的元组。结果只读，
+用 cache_resource 直接返回同一个对象，命中时不再序列化和拷贝。
+"""
+
+import streamlit as st
+from analytics import (
+    country_stats,
+    genre_cooccurrence,
+    genre_rating_stats,
+    individual_genre_counts,
+    split_genres,
+)
+from utils import load_data, apply_filters
+
+
+def _filtered_movies(signature):
+    """根据筛选签名重新得到筛选后的数据"""
+    df, _ = load_data(False)
+    return apply_filters(df, *signature)
+
+
+@st.cache_resource(max_entries=64)
+def cached_country_stats(signature):
+    """各国家/地区电影数量和平均评分（至少5部电影，前20名），一次分组同时得到"""
+    return country_stats(_filtered_movies(signature), min_movies=5, top_n=20)
+
+
+@st.cache_resource(max_entries=64)
+def cached_genre_analysis(signature):
+    """类型数量、类型平均评分和 Top 10 类型共现矩阵"""
+    filtered_df = _filtered_movies(signature)
+    split_lists = split_genres(filtered_df)
+    genre_counts = individual_genre_counts(split_lists)
+    genre_rating = genre_rating_stats(
+        split_lists, filtered_df["rating"].to_numpy(), min_movies=5, top_n=15
+    )
+    cooccurrence = genre_cooccurrence(split_lists, list(genre_counts.index[:10]))
+    return genre_counts, genre_rating, cooccurrence
@@ -10,8 +10,8 @@ SCRAPER_CONFIG = {
     "cache_dir": CACHE_DIR,
     "cache_filename": CACHE_FILE,
     "use_cache": True,
-    "min_delay": 1.0,
-    "max_delay": 2.5,
+    "max_rate": 2.0,
+    "max_workers": 4,
 }
 
 # Streamlit 页面配置
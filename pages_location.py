@@ -1,12 +1,16 @@
 import streamlit as st
 import plotly.express as px
-from analytics import movies_per_country
+from cached_analytics import cached_country_stats
+from utils import scale_colors
 
 
-def render_location_analysis(filtered_df):
+def render_location_analysis(signature):
     """渲染地区分布页面"""
     st.header("🌍 地区分布分析")
     
+    # 数量排行、占比饼图和平均评分共用同一次分组结果
+    country_counts, country_rating = cached_country_stats(signature)
+    
     col1, col2 = st.columns([2, 1])
     
     # ==================== 各国电影数量排行 ====================
@@ -26,21 +30,20 @@ def render_location_analysis(filtered_df):
         
         top_n = st.slider("显示前 N 个国家/地区", min_value=5, max_value=30, value=15, step=5)
         
-        country_counts = movies_per_country(filtered_df, top_n=top_n)
+        top_countries = country_counts.head(top_n)
         
         fig = px.bar(
-            x=country_counts.values,
-            y=country_counts.index,
+            x=top_countries.values,
+            y=top_countries.index,
             orientation='h',
             labels={"x": "电影数量", "y": "国家/地区"},
-            color=country_counts.values,
-            color_continuous_scale="Sunset",
         )
         fig.update_layout(
             yaxis=dict(autorange="reversed"),
             showlegend=False,
             height=600,
         )
+        fig.update_traces(marker_color=scale_colors(top_countries.values, "Sunset"))
         st.plotly_chart(fig, use_container_width=True)
     
     # ==================== 国家占比饼图 ====================
@@ -58,7 +61,7 @@ def render_location_analysis(filtered_df):
         - 反映选片的地理多样性
         """)
         
-        top_10_countries = movies_per_country(filtered_df, top_n=10)
+        top_10_countries = country_counts.head(10)
         
         fig = px.pie(
             values=top_10_countries.values,
@@ -86,27 +89,20 @@ def render_location_analysis(filtered_df):
     - 可识别出"高质量出品国"
     """)
     
-    country_rating = (
-        filtered_df.dropna(subset=["country"])
-        .groupby("country")
-        .agg({"rating": ["mean", "count"]})
-        .reset_index()
-    )
-    country_rating.columns = ["country", "avg_rating", "count"]
-    country_rating = country_rating[country_rating["count"] >= 5].sort_values("avg_rating", ascending=False).head(20)
-    
     fig = px.bar(
         country_rating,
         x="avg_rating",
         y="country",
         orientation='h',
-        color="avg_rating",
-        color_continuous_scale="RdYlGn",
         text="avg_rating",
         labels={"avg_rating": "平均评分", "country": "国家/地区"},
     )
     fig.update_layout(yaxis=dict(autorange="reversed"), showlegend=False)
-    fig.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+    fig.update_traces(
+        texttemplate='%{text:.2f}',
+        textposition='outside',
+        marker_color=scale_colors(country_rating["avg_rating"], "RdYlGn"),
+    )
     st.plotly_chart(fig, use_container_width=True)
     
     # 详细数据
@@ -1,5 +1,7 @@
 import streamlit as st
 import plotly.express as px
+from analytics import top_movies
+from utils import scale_colors
 
 
 def render_ranking(filtered_df):
@@ -24,15 +26,13 @@ def render_ranking(filtered_df):
         - 可作为高质量观影参考
         """)
         
-        top_rated = filtered_df.nlargest(15, "rating")[["rank", "title", "year", "rating", "votes"]]
+        top_rated = top_movies(filtered_df, "rating", 15)[["rank", "title", "year", "rating", "votes"]]
         
         fig = px.bar(
             top_rated,
             x="rating",
             y="title",
             orientation="h",
-            color="rating",
-            color_continuous_scale="YlOrRd",
             text="rating",
             labels={"rating": "评分", "title": "电影名称"},
         )
@@ -41,7 +41,11 @@ def render_ranking(filtered_df):
             showlegend=False,
             height=500,
         )
-        fig.update_traces(texttemplate='%{text:.1f}', textposition='outside')
+        fig.update_traces(
+            texttemplate='%{text:.1f}',
+            textposition='outside',
+            marker_color=scale_colors(top_rated["rating"], "YlOrRd"),
+        )
         st.plotly_chart(fig, use_container_width=True)
         
         # 显示详细数据
@@ -65,15 +69,13 @@ def render_ranking(filtered_df):
         - 不一定评分最高，但最受关注
         """)
         
-        most_voted = filtered_df.nlargest(15, "votes")[["rank", "title", "year", "rating", "votes"]]
+        most_voted = top_movies(filtered_df, "votes", 15)[["rank", "title", "year", "rating", "votes"]]
         
         fig = px.bar(
             most_voted,
             x="votes",
             y="title",
             orientation="h",
-            color="votes",
-            color_continuous_scale="Blues",
             text="votes",
             labels={"votes": "评价人数", "title": "电影名称"},
         )
@@ -82,7 +84,11 @@ def render_ranking(filtered_df):
             showlegend=False,
             height=500,
         )
-        fig.update_traces(texttemplate='%{text:,.0f}', textposition='outside')
+        fig.update_traces(
+            texttemplate='%{text:,.0f}',
+            textposition='outside',
+            marker_color=scale_colors(most_voted["votes"], "Blues"),
+        )
         st.plotly_chart(fig, use_container_width=True)
         
         # 显示详细数据
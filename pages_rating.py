@@ -1,6 +1,7 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+from analytics import decade_rating_stats, rating_counts
 
 
 def render_rating_analysis(filtered_df):
@@ -25,13 +26,14 @@ def render_rating_analysis(filtered_df):
         - 用于理解整体评分水平
         """)
         
-        fig = px.histogram(
-            filtered_df,
-            x="rating",
-            nbins=30,
-            labels={"rating": "评分", "count": "电影数量"},
-            color_discrete_sequence=["#3498db"],
-        )
+        # 在服务端按 0.1 分统计数量，只把每档的计数发给前端
+        counts = rating_counts(filtered_df)
+        fig = go.Figure(go.Bar(
+            x=counts.index,
+            y=counts.values,
+            marker_color="#3498db",
+            hovertemplate="评分: %{x:.1f}<br>电影数量: %{y}<extra></extra>",
+        ))
         fig.update_layout(
             showlegend=False,
             bargap=0.1,
@@ -91,14 +93,7 @@ def render_rating_analysis(filtered_df):
     - 可以发现"黄金年代"和"衰落期"
     """)
     
-    decade_rating = (
-        filtered_df.dropna(subset=["decade"])
-        .groupby("decade")
-        .agg({"rating": ["mean", "count"]})
-        .reset_index()
-    )
-    decade_rating.columns = ["decade", "avg_rating", "count"]
-    decade_rating = decade_rating.sort_values("decade")
+    decade_rating = decade_rating_stats(filtered_df)
     
     fig = go.Figure()
     
@@ -1,20 +1,39 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-import json
-import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field, fields
+from io import BytesIO
+import logging
+from operator import itemgetter
+import os
+import re
+import threading
 import time
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Tuple
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 BASE_URL = "https://movie.douban.com/top250"
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+# Precompiled patterns for the info block and the vote count.
+# 导演：第一个"导演:"之后到下一个"导演:"/"主演:"为止；主演：之后的第一个"主演:"到下一个"主演:"为止
+_CREW_RE = re.compile(
+    r"(?:.*?导演:(?P<directors>.*?)(?=导演:|主演:|$))?(?:.*?主演:(?P<actors>.*?)(?=主演:|$))?",
+    re.S,
+)
+_DIGITS_RE = re.compile(r"\d+")
+
+
+@dataclass(slots=True)
 class Movie:
     """Container for the metadata of a single movie."""
 
@@ -30,15 +49,20 @@ class Movie:
     detail_url: str
     poster_url: Optional[str] = None
     is_playable: bool = False
-    directors: List[str] = None
-    actors: List[str] = None
-    
-    def __post_init__(self):
-        """Initialize mutable default fields."""
-        if self.directors is None:
-            self.directors = []
-        if self.actors is None:
-            self.actors = []
+    directors: List[str] = field(default_factory=list)
+    actors: List[str] = field(default_factory=list)
+
+
+# Pulls a cached movie dict's values out in `Movie` field order, in one C call.
+_movie_values = itemgetter(*(f.name for f in fields(Movie)))
+
+
+def _movie_from_dict(data: dict) -> Movie:
+    try:
+        return Movie(*_movie_values(data))
+    except KeyError:
+        # Older cache files may lack fields that have defaults.
+        return Movie(**data)
 
 
 class DoubanTop250Scraper:
@@ -50,17 +74,37 @@ class DoubanTop250Scraper:
         *,
         cache_filename: str = "douban_top250.json",
         use_cache: bool = True,
-        min_delay: float = 1.0,
-        max_delay: float = 2.5,
+        max_rate: float = 2.0,
+        max_workers: int = 4,
     ) -> None:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_path = self.cache_dir / cache_filename
         self.use_cache = use_cache
-        self.min_delay = min_delay
-        self.max_delay = max_delay
+        self.max_rate = max_rate
+        self.max_workers = max_workers
+        # Shared pacing state for all workers, see `_wait_for_slot`.
+        self._rate_lock = threading.Lock()
+        self._next_slot = 0.0
+        self._last_latency = 0.0
+        # Movies last read from the cache file, keyed by its (mtime, size).
+        self._cache_mem: Optional[Tuple[Tuple[int, int], List[Movie]]] = None
 
         self.session = requests.Session()
+        # Reuse pooled keep-alive connections across pages and retry transient
+        # failures (including 429, honouring Retry-After) with backoff.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+        )
+        # One host, one keep-alive connection per fetch worker.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Accept-Encoding is left to requests: it advertises br alongside
+        # gzip/deflate whenever brotli is installed and decodes it transparently.
         self.session.headers.update(
             {
                 "User-Agent": (
@@ -78,206 +122,238 @@ class DoubanTop250Scraper:
         if self.use_cache and not force_refresh and self.cache_path.exists():
             return self._load_from_cache()
 
-        movies: List[Movie] = []
-        for start in range(0, 250, 25):
-            page_movies = self._fetch_page(start=start)
-            movies.extend(page_movies)
-            self._respectful_delay()
+        # Pages are independent, so fetch up to `max_workers` of them at once;
+        # request starts are still paced across workers by `_wait_for_slot`.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pages = pool.map(lambda start: self._fetch_page(start=start), range(0, 250, 25))
+            movies: List[Movie] = [movie for page in pages for movie in page]
 
         if self.use_cache:
             self._write_cache(movies)
 
         return movies
 
+    def fetch_movies_raw(self, *, force_refresh: bool = False) -> List[dict]:
+        """Like `fetch_movies`, but return plain dicts.
+
+        On a cache hit the decoded JSON is returned as-is, skipping `Movie`
+        construction entirely.
+        """
+        if self.use_cache and not force_refresh and self.cache_path.exists():
+            return orjson.loads(self.cache_path.read_bytes())
+        return [asdict(movie) for movie in self.fetch_movies(force_refresh=force_refresh)]
+
     # Internal helpers -----------------------------------------------------------
     def _fetch_page(self, *, start: int) -> List[Movie]:
         """Fetch a single page of the toplist."""
         params = {"start": start}
+        self._wait_for_slot()
         response = self.session.get(BASE_URL, params=params, timeout=15)
+        self._last_latency = response.elapsed.total_seconds()
         response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, "html.parser")
-        grid_view = soup.find("ol", class_="grid_view")
-        if not grid_view:
-            raise ValueError("Unable to locate movies list on the page.")
-
-        movies: List[Movie] = []
-        for li in grid_view.find_all("li"):
-            try:
-                movie = self._parse_movie(li)
-                movies.append(movie)
-            except Exception as exc:  # pragma: no cover - defensive parsing
-                print(f"Skipping movie due to parsing error: {exc}")
-        return movies
-
-    def _parse_movie(self, li) -> Movie:
-        """解析单个电影条目的HTML结构"""
-        # 排名
-        rank_tag = li.find("em")
-        rank = int(rank_tag.get_text(strip=True)) if rank_tag else 0
-
-        # 标题 - 可能有多个title span，第一个是中文名，第二个可能是英文名
-        title_tags = li.find_all("span", class_="title")
-        title = ""
-        original_title = None
-        
-        if title_tags:
-            title = title_tags[0].get_text(strip=True)
-            # 如果有第二个title，通常是英文名
-            if len(title_tags) > 1:
-                second_title = title_tags[1].get_text(strip=True).lstrip("/").strip()
-                if second_title:
-                    original_title = second_title
-        
-        # 其他标题（别名）
-        other_title_tag = li.find("span", class_="other")
-        if other_title_tag and not original_title:
-            other_text = other_title_tag.get_text(strip=True).lstrip("/").strip()
-            if other_text:
-                # 如果有多个别名，取第一个
-                original_title = other_text.split("/")[0].strip() if "/" in other_text else other_text
-
-        # 详情链接和海报
-        detail_link = li.find("a")
-        detail_url = detail_link["href"] if detail_link and detail_link.has_attr("href") else ""
-        
-        # 海报图片链接
-        poster_url = None
-        img_tag = li.find("img")
-        if img_tag and img_tag.has_attr("src"):
-            poster_url = img_tag["src"]
-
-        # 是否可播放
-        is_playable = False
-        playable_tag = li.find("span", class_="playable")
-        if playable_tag:
-            is_playable = True
-
-        # 导演和演员信息
-        directors: List[str] = []
-        actors: List[str] = []
-        info_block = li.find("p")
-        
-        if info_block:
-            info_text = info_block.get_text(strip=True)
-            # 查找"导演"和"主演"的相关信息
-            try:
-                if "导演:" in info_text:
-                    # 提取导演信息
-                    director_part = info_text.split("主演:")[0] if "主演:" in info_text else info_text
-                    if "导演:" in director_part:
-                        director_parts = director_part.split("导演:")
-                        if len(director_parts) > 1:
-                            director_text = director_parts[1].strip()
-                            # 解析导演名单（通常以 / 分隔）
-                            director_list = [d.strip() for d in director_text.split("/") if d.strip()]
-                            directors = director_list[:3]  # 取前三个导演
-                
-                if "主演:" in info_text:
-                    # 提取演员信息
-                    actors_parts = info_text.split("主演:")
-                    if len(actors_parts) > 1:
-                        actors_part = actors_parts[1]
-                        # 查找是否有"<br"或其他分隔符
-                        actors_text = actors_part.split("<br")[0] if "<br" in actors_part else actors_part
-                        # 解析演员名单（通常以 / 分隔）
-                        actor_list = [a.strip() for a in actors_text.split("/") if a.strip()]
-                        actors = actor_list[:5]  # 取前五个演员
-            except (IndexError, AttributeError, TypeError):
-                # 忽略导演/演员提取错误
-                pass
-
-        # 年份、国家、类型信息
-        year = country = None
-        genres: List[str] = []
-        
-        if info_block:
-            # 获取所有文本行
-            info_text_full = info_block.get_text(separator="\n", strip=True)
-            info_lines = [line.strip() for line in info_text_full.split("\n") if line.strip()]
-            
-            # 最后一行通常是：年份 / 国家 / 类型1 / 类型2 ...
-            if info_lines:
-                metadata_line = info_lines[-1]
-                # 替换 &nbsp; 和其他空白字符
-                metadata_line = metadata_line.replace("\xa0", " ").replace("&nbsp;", " ")
-                # 按 / 分割
-                parts = [part.strip() for part in metadata_line.split("/") if part.strip()]
-                
-                if parts:
-                    # 第一部分是年份
-                    year = _safe_int(parts[0])
-                    # 第二部分是国家
-                    if len(parts) > 1:
-                        country = parts[1]
-                    # 剩余部分是类型
-                    if len(parts) > 2:
-                        genres = parts[2:]
-
-        # 评分
-        rating_tag = li.find("span", class_="rating_num")
-        rating = 0.0
-        if rating_tag:
-            rating_text = rating_tag.get_text(strip=True)
-            try:
-                rating = float(rating_text)
-            except (ValueError, TypeError):
-                rating = 0.0
-
-        # 评价人数 - 在评分后面的span中
-        votes = 0
-        rating_div = li.find("div", class_="bd")
-        if rating_div:
-            # 查找包含"人评价"的span
-            vote_spans = rating_div.find_all("span")
-            for span in vote_spans:
-                span_text = span.get_text(strip=True)
-                if "人评价" in span_text or "评价" in span_text:
-                    votes = _extract_vote_count(span_text)
-                    break
-        
-        # 如果没找到，尝试从star div中查找
-        if votes == 0:
-            star_div = li.find("div", class_="star")
-            if star_div:
-                vote_spans = star_div.find_all("span")
-                if vote_spans:
-                    last_span = vote_spans[-1]
-                    votes = _extract_vote_count(last_span.get_text(strip=True))
-
-        # 经典台词/短评
-        quote_tag = li.find("span", class_="inq")
-        quote = quote_tag.get_text(strip=True) if quote_tag else None
-
-        return Movie(
-            rank=rank,
-            title=title,
-            original_title=original_title,
-            year=year,
-            country=country,
-            genres=genres,
-            rating=rating,
-            votes=votes,
-            quote=quote,
-            detail_url=detail_url,
-            poster_url=poster_url,
-            is_playable=is_playable,
-            directors=directors,
-            actors=actors,
-        )
-
-    def _respectful_delay(self) -> None:
-        """Sleep for a random interval to avoid hammering Douban."""
-        delay = random.uniform(self.min_delay, self.max_delay)
-        time.sleep(delay)
+        # Hand lxml the raw bytes so it decodes them itself instead of
+        # requests guessing the text encoding first.
+        return _parse_html(response.content, encoding=response.encoding)
+
+    def _wait_for_slot(self) -> None:
+        """Block until this worker may issue its next request.
+
+        Request starts are spaced at least ``1 / max_rate`` seconds apart across
+        all workers. When Douban answers slowly the spacing stretches to the
+        latest observed latency, so we back off along with the server; 429s are
+        additionally retried by the session adapter, honouring Retry-After.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + max(1.0 / self.max_rate, self._last_latency)
+        time.sleep(slot - now)
 
     def _write_cache(self, movies: Iterable[Movie]) -> None:
         data = [asdict(movie) for movie in movies]
-        self.cache_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        # Write to a sibling file and rename it into place, so an interrupted
+        # write never leaves a truncated cache behind.
+        tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, self.cache_path)
 
     def _load_from_cache(self) -> List[Movie]:
-        raw = json.loads(self.cache_path.read_text(encoding="utf-8"))
-        return [Movie(**movie_dict) for movie_dict in raw]
+        stat = self.cache_path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._cache_mem is not None and self._cache_mem[0] == key:
+            return self._cache_mem[1]
+        raw = orjson.loads(self.cache_path.read_bytes())
+        movies = [_movie_from_dict(movie_dict) for movie_dict in raw]
+        self._cache_mem = (key, movies)
+        return movies
+
+
+def _parse_html(html: bytes | str, *, encoding: Optional[str] = None) -> List[Movie]:
+    """Parse the movies out of one toplist page.
+
+    Kept free of scraper state so it can run in any worker, thread or process.
+    The page is stream-parsed: each movie <li> is parsed as soon as it is
+    complete and then discarded, so only one entry's subtree stays resident.
+    """
+    if isinstance(html, str):
+        html, encoding = html.encode("utf-8"), "utf-8"
+    context = etree.iterparse(
+        BytesIO(html), events=("end",), tag=("li", "ol"), html=True, encoding=encoding
+    )
+
+    found_grid_view = False
+    movies: List[Movie] = []
+    for _, element in context:
+        if element.tag == "ol":
+            found_grid_view = found_grid_view or _is_grid_view(element)
+            continue
+        parent = element.getparent()
+        if parent is None or parent.tag != "ol" or not _is_grid_view(parent):
+            continue
+        movie = _parse_movie(element)
+        if movie is not None:
+            movies.append(movie)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Skipping list entry without rank or title: %r", _text(element)[:80])
+        element.clear()
+        while element.getprevious() is not None:
+            del parent[0]
+
+    if not found_grid_view:
+        raise ValueError("Unable to locate movies list on the page.")
+    return movies
+
+
+def _is_grid_view(element) -> bool:
+    return "grid_view" in (element.get("class") or "").split()
+
+
+def _parse_movie(li) -> Optional[Movie]:
+    """解析单个电影条目的HTML结构，缺少排名或标题时返回 None"""
+    # 一次遍历条目子树，按标签/class 建立索引，后续查找都不再重复遍历
+    first, spans = _index_elements(li)
+
+    # 排名
+    rank_tag = first.get("em")
+    rank = _safe_int(_text(rank_tag)) if rank_tag is not None else None
+
+    # 标题 - 可能有多个title span，第一个是中文名，第二个可能是英文名
+    title_tags = spans.get("title", [])
+    title = ""
+    original_title = None
+    
+    if title_tags:
+        title = _text(title_tags[0])
+        # 如果有第二个title，通常是英文名
+        if len(title_tags) > 1:
+            second_title = _text(title_tags[1]).lstrip("/").strip()
+            if second_title:
+                original_title = second_title
+
+    if not rank or not title:
+        return None
+    
+    # 其他标题（别名）
+    other_title_tag = _first(spans.get("other"))
+    if other_title_tag is not None and not original_title:
+        other_text = _text(other_title_tag).lstrip("/").strip()
+        if other_text:
+            # 如果有多个别名，取第一个
+            original_title = other_text.split("/")[0].strip() if "/" in other_text else other_text
+
+    # 详情链接和海报
+    link = first.get("a")
+    detail_url = (link.get("href") if link is not None else None) or ""
+    
+    # 海报图片链接
+    poster = first.get("img")
+    poster_url = poster.get("src") if poster is not None else None
+
+    # 是否可播放
+    is_playable = "playable" in spans
+
+    # 导演和演员信息
+    directors: List[str] = []
+    actors: List[str] = []
+    info_block = first.get("p")
+    # 信息块只遍历一次：按行切分后既用于导演/演员，也用于最后的元数据行
+    info_lines = _strings(info_block) if info_block is not None else []
+    
+    if info_lines:
+        # 一次匹配同时取出导演和主演，以 / 分隔，分别取前三个和前五个
+        crew = _CREW_RE.match(" ".join(info_lines))
+        directors = [d.strip() for d in (crew["directors"] or "").split("/") if d.strip()][:3]
+        actors = [a.strip() for a in (crew["actors"] or "").split("/") if a.strip()][:5]
+
+    # 年份、国家、类型信息
+    year = country = None
+    genres: List[str] = []
+    
+    # 最后一行通常是：年份 / 国家 / 类型1 / 类型2 ...
+    if info_lines:
+        metadata_line = info_lines[-1]
+        # 替换 &nbsp; 和其他空白字符
+        metadata_line = metadata_line.replace("\xa0", " ").replace("&nbsp;", " ")
+        # 按 / 分割
+        parts = [part.strip() for part in metadata_line.split("/") if part.strip()]
+        
+        if parts:
+            # 第一部分是年份
+            year = _safe_int(parts[0])
+            # 第二部分是国家
+            if len(parts) > 1:
+                country = parts[1]
+            # 剩余部分是类型
+            if len(parts) > 2:
+                genres = parts[2:]
+
+    # 评分
+    rating_tag = _first(spans.get("rating_num"))
+    rating = 0.0
+    if rating_tag is not None:
+        rating_text = _text(rating_tag)
+        try:
+            rating = float(rating_text)
+        except (ValueError, TypeError):
+            rating = 0.0
+
+    # 评价人数 - 在评分后面的span中
+    votes = 0
+    bd = first.get("div.bd")
+    for span in (bd.iter("span") if bd is not None else ()):
+        # 查找包含"人评价"的span
+        span_text = _text(span)
+        if "人评价" in span_text or "评价" in span_text:
+            votes = _extract_vote_count(span_text)
+            break
+    
+    # 如果没找到，尝试从star div中查找
+    if votes == 0:
+        star = first.get("div.star")
+        vote_spans = list(star.iter("span")) if star is not None else []
+        if vote_spans:
+            votes = _extract_vote_count(_text(vote_spans[-1]))
+
+    # 经典台词/短评
+    quote_tag = _first(spans.get("inq"))
+    quote = _text(quote_tag) if quote_tag is not None else None
+
+    return Movie(
+        rank=rank,
+        title=title,
+        original_title=original_title,
+        year=year,
+        country=country,
+        genres=genres,
+        rating=rating,
+        votes=votes,
+        quote=quote,
+        detail_url=detail_url,
+        poster_url=poster_url,
+        is_playable=is_playable,
+        directors=directors,
+        actors=actors,
+    )
 
 
 def _safe_int(value: str | None) -> Optional[int]:
@@ -289,9 +365,44 @@ def _safe_int(value: str | None) -> Optional[int]:
         return None
 
 
+def _first(results: Optional[list]):
+    return results[0] if results else None
+
+
+def _index_elements(li) -> Tuple[dict, dict]:
+    """Index an entry's subtree in a single walk.
+
+    Returns the first element per tag (divs additionally per class, as
+    ``"div.<class>"``) and every <span> grouped by each of its class tokens.
+    """
+    first: dict = {}
+    spans: dict = {}
+    for element in li.iter(etree.Element):
+        tag = element.tag
+        if tag == "span":
+            for token in (element.get("class") or "").split():
+                spans.setdefault(token, []).append(element)
+            continue
+        first.setdefault(tag, element)
+        if tag == "div":
+            for token in (element.get("class") or "").split():
+                first.setdefault(f"div.{token}", element)
+    return first, spans
+
+
+def _strings(element) -> List[str]:
+    """Stripped, non-empty text fragments of an element, in document order."""
+    return [text.strip() for text in element.itertext() if text.strip()]
+
+
+def _text(element) -> str:
+    """Equivalent of BeautifulSoup's ``get_text(strip=True)``."""
+    return "".join(_strings(element))
+
+
 def _extract_vote_count(value: str) -> int:
-    digits = "".join(char for char in value if char.isdigit())
-    return int(digits) if digits else 0
+    match = _DIGITS_RE.search(value)
+    return int(match.group()) if match else 0
 
 
 __all__ = ["DoubanTop250Scraper", "Movie"]
@@ -1,15 +1,22 @@
 """工具函数和辅助模块"""
 
+import numpy as np
+import pandas as pd
 import streamlit as st
 from pathlib import Path
+from plotly.colors import get_colorscale, sample_colorscale
 from scraper import DoubanTop250Scraper
 from analytics import load_cached_movies, movies_to_dataframe
 from config import CACHE_PATH, SCRAPER_CONFIG
 
 
-@st.cache_data
+@st.cache_resource
 def load_data(force_refresh=False):
-    """加载或爬取电影数据"""
+    """加载或爬取电影数据
+
+    数据在整个应用中只读，用 cache_resource 直接复用同一个 DataFrame，
+    避免 cache_data 每次命中都要序列化和拷贝整个表。
+    """
     cache_path = Path(CACHE_PATH)
     
     if cache_path.exists() and not force_refresh:
@@ -43,13 +50,9 @@ def init_sidebar(df):
         st.sidebar.warning("⚠️ 数据加载中...")
         return force_refresh, 0, 10, []
     
-    # 评分范围筛选
-    try:
-        min_rating = float(df["rating"].min())
-        max_rating = float(df["rating"].max())
-    except (KeyError, TypeError, ValueError):
-        min_rating, max_rating = 0, 10
+    (min_rating, max_rating), decades = _sidebar_options(df)
     
+    # 评分范围筛选
     rating_range = st.sidebar.slider(
         "评分范围",
         min_value=min_rating,
@@ -59,11 +62,6 @@ def init_sidebar(df):
     )
     
     # 年代筛选
-    try:
-        decades = sorted([d for d in df["decade"].dropna().unique() if d is not None])
-    except (KeyError, TypeError):
-        decades = []
-    
     if decades:
         selected_decades = st.sidebar.multiselect(
             "选择年代",
@@ -76,43 +74,88 @@ def init_sidebar(df):
     return force_refresh, rating_range[0], rating_range[1], selected_decades
 
 
+def _sidebar_options(df):
+    """计算评分范围和年代选项，按数据对象缓存在 session_state 中，避免每次交互都重新扫描"""
+    cached = st.session_state.get("_sidebar_options")
+    if cached is not None and cached[0] is df:
+        return cached[1], cached[2]
+    
+    try:
+        rating_bounds = (float(df["rating"].min()), float(df["rating"].max()))
+    except (KeyError, TypeError, ValueError):
+        rating_bounds = (0, 10)
+    
+    try:
+        decades = sorted([d for d in df["decade"].dropna().unique() if d is not None])
+    except (KeyError, TypeError):
+        decades = []
+    
+    st.session_state["_sidebar_options"] = (df, rating_bounds, decades)
+    return rating_bounds, decades
+
+
 def apply_filters(df, min_rating, max_rating, selected_decades):
     """应用数据筛选"""
-    filtered_df = df[
-        (df["rating"] >= min_rating) & 
-        (df["rating"] <= max_rating)
-    ]
+    ratings = df["rating"].to_numpy()
+    mask = (ratings >= min_rating) & (ratings <= max_rating)
     if selected_decades:
-        filtered_df = filtered_df[filtered_df["decade"].isin(selected_decades)]
-    return filtered_df
+        decade = df["decade"]
+        if isinstance(decade.dtype, pd.CategoricalDtype):
+            # 分类列直接比较整数编码，-1 表示该年代不在类别中
+            codes = decade.cat.categories.get_indexer(list(selected_decades))
+            mask &= np.isin(decade.cat.codes.to_numpy(), codes[codes >= 0])
+        else:
+            mask &= decade.isin(selected_decades).to_numpy()
+    return df.iloc[mask]
+
+
+def get_filter_signature(min_rating, max_rating, selected_decades):
+    """把筛选条件压缩成可哈希的小元组，用作聚合缓存的键"""
+    return (min_rating, max_rating, tuple(sorted(selected_decades)))
+
+
+def scale_colors(values, colorscale):
+    """按数值在色阶上预先取色，返回每个柱子的颜色，代替 Plotly 的连续色阶映射"""
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return []
+    low, high = values.min(), values.max()
+    if high > low:
+        positions = (values - low) / (high - low)
+    else:
+        positions = np.full(len(values), 0.5)
+    return sample_colorscale(get_colorscale(colorscale), positions.tolist())
+
+
+# 页面样式在导入时压缩成一行，每次重跑只需原样发送
+# 注意：Streamlit 每次重跑都会移除本次未输出的元素，所以样式必须每次都输出
+_PAGE_STYLE = " ".join(
+    """
+    <style>
+    .main-header {
+        font-size: 3rem;
+        font-weight: bold;
+        text-align: center;
+        color: #2c3e50;
+        margin-bottom: 1rem;
+    }
+    .sub-header {
+        font-size: 1.2rem;
+        text-align: center;
+        color: #7f8c8d;
+        margin-bottom: 2rem;
+    }
+    .metric-card {
+        background-color: #f8f9fa;
+        border-radius: 10px;
+        padding: 20px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }
+    </style>
+    """.split()
+)
 
 
 def init_page_style():
     """初始化页面样式"""
-    st.markdown(
-        """
-        <style>
-        .main-header {
-            font-size: 3rem;
-            font-weight: bold;
-            text-align: center;
-            color: #2c3e50;
-            margin-bottom: 1rem;
-        }
-        .sub-header {
-            font-size: 1.2rem;
-            text-align: center;
-            color: #7f8c8d;
-            margin-bottom: 2rem;
-        }
-        .metric-card {
-            background-color: #f8f9fa;
-            border-radius: 10px;
-            padding: 20px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
+    st.markdown(_PAGE_STYLE, unsafe_allow_html=True)